@@ -7,12 +7,62 @@ import numpy as np
 import json
 import os
 
+from . import _kernels
+
+# joblib is optional: with it installed the telemetry fetch runs across
+# threads (FastF1 releases the GIL while decoding), otherwise sequentially
+try:
+    from joblib import Parallel, delayed
+    HAS_JOBLIB = True
+except Exception:
+    HAS_JOBLIB = False
+
+# polars is optional: with it installed the per-lap aggregations run on its
+# multi-threaded lazy engine, otherwise on the kernels in _kernels
+try:
+    import polars as pl
+    HAS_POLARS = True
+except Exception:
+    HAS_POLARS = False
+
 # Ensure FastF1 default styling is applied when this module is imported
 try:
     fastf1.plotting.setup_mpl()
 except Exception:
     pass
 
+class MetricResult:
+    """
+    Deferred result of a metric computation.
+
+    Holds a zero-argument compute function plus the plot styling, so the
+    DataFrame is only materialized when .df() or .plot() is called. Metric
+    methods return one of these with defer=True, letting several metrics be
+    batched through CircuitAnalyzer.run() against the shared telemetry stack.
+    """
+    def __init__(self, analyzer, compute, title, ylabel, filename_suffix, higher_is_better):
+        self.analyzer = analyzer
+        self.compute = compute
+        self.title = title
+        self.ylabel = ylabel
+        self.filename_suffix = filename_suffix
+        self.higher_is_better = higher_is_better
+        self._df = None
+
+    def df(self):
+        """Materializes (and caches) the metric DataFrame."""
+        if self._df is None:
+            self._df = self.compute()
+        return self._df
+
+    def plot(self, dpi=150, show=True):
+        """Materializes the DataFrame and renders the distribution plot."""
+        self.analyzer._plot_distribution(
+            self.df(), 'Driver', 'Value', self.title, self.ylabel,
+            self.filename_suffix, higher_is_better=self.higher_is_better,
+            dpi=dpi, show=show
+        )
+
 class CircuitAnalyzer:
     """
     Main controller for analyzing corner performance.
@@ -22,7 +72,12 @@ class CircuitAnalyzer:
         Corner = CircuitAnalyzer(session)
         Corner.entry.braking_dist(7)       # Specific corner
         Corner.all.velo_dist()             # Average across ALL corners
+        Corner.corner_report(7)            # All four metrics in one pass
     """
+    # Shared across instances so building one analyzer per session only
+    # pays the disk read + JSON parse once
+    _team_colors_cache = None
+
     def __init__(self, session, team_colors=None):
         self.session = session
         
@@ -35,7 +90,37 @@ class CircuitAnalyzer:
         print("Initializing CircuitAnalyzer: Pre-filtering laps...")
         self.laps = session.laps.pick_quicklaps().pick_wo_box()
         self.circuit_info = session.get_circuit_info()
-        
+
+        # Telemetry cache keyed by (driver, lap number) so repeat analyses
+        # reuse the same distance-augmented frame instead of recomputing it
+        self._tel_cache = {}
+        self._stacked_tel = None
+        self._stacked_dist = None
+        self._window_cache = {}
+
+        # FastF1 driver accessors re-scan their internals on every call, so
+        # resolve driver info / laps / team once; later lookups are dict hits
+        self._driver_info = {drv: session.get_driver(drv) for drv in session.drivers}
+        self._driver_laps = {drv: self.laps.pick_drivers(drv) for drv in session.drivers}
+        self._driver_team = {drv: laps.iloc[0]['Team'] if not laps.empty else None
+                             for drv, laps in self._driver_laps.items()}
+
+        # Driver code -> plot color, built once from the cached team map
+        self._driver_palette = {
+            info['Abbreviation']: self.team_colors.get(self._driver_team[drv], '#CCCCCC')
+            for drv, info in self._driver_info.items()
+        }
+
+        # Precomputed corner windows as IntervalIndexes so telemetry rows can
+        # be labelled with their corner in a single get_indexer() call
+        self._corner_distances = np.sort(self.circuit_info.corners['Distance'].to_numpy())
+        self._corner_numbers = (self.circuit_info.corners.sort_values('Distance')['Number']
+                                .astype(int).to_numpy())
+        self._apex_intervals = self._corner_windows(20, 20)
+        self._brake_intervals = self._corner_windows(250, 50)
+        self._corner_dist = dict(zip(self.circuit_info.corners['Number'].astype(int),
+                                     self.circuit_info.corners['Distance'].astype(float)))
+
         # Initialize sub-modules
         self.entry = EntryPhase(self)
         self.exit = ExitPhase(self)
@@ -43,23 +128,148 @@ class CircuitAnalyzer:
 
     def _load_default_colors(self):
         """Loads team_colors.json from the same directory as this script."""
+        if CircuitAnalyzer._team_colors_cache is not None:
+            return CircuitAnalyzer._team_colors_cache
         try:
             current_dir = os.path.dirname(__file__)
             path = os.path.join(current_dir, 'team_colors.json')
             with open(path, 'r') as f:
-                return json.load(f)
+                CircuitAnalyzer._team_colors_cache = json.load(f)
+            return CircuitAnalyzer._team_colors_cache
         except Exception as e:
             print(f"Warning: Could not load team_colors.json. {e}")
             return {}
 
+    def _get_tel(self, lap):
+        """Returns the distance-augmented car data for a lap, cached per (driver, lap)."""
+        key = (lap['Driver'], int(lap['LapNumber']))
+        car = self._tel_cache.get(key)
+        if car is None:
+            car = lap.get_car_data().add_distance()
+            # Narrow the hot columns: the metric scans are memory-bound, so
+            # halving the bytes per row roughly halves mask/reduce time
+            car = car.astype({'Distance': 'float32', 'Speed': 'float32',
+                              'Brake': 'int8', 'Throttle': 'int8'})
+            self._tel_cache[key] = car
+        return car
+
+    def _corner_windows(self, before, after):
+        """
+        Builds one disjoint Interval per corner spanning (-before, +after)
+        meters around the apex. Windows are clipped at the midpoint to the
+        neighbouring corner, so each sample maps to its nearest corner even
+        where wide windows would otherwise overlap.
+        """
+        dist = self._corner_distances
+        left = dist - before
+        right = dist + after
+        if len(dist) > 1:
+            mid = (dist[:-1] + dist[1:]) / 2
+            left[1:] = np.maximum(left[1:], mid)
+            right[:-1] = np.minimum(right[:-1], mid)
+        return pd.IntervalIndex.from_arrays(left, right)
+
+    def _all_telemetry(self):
+        """
+        Stacks the telemetry of every filtered lap into one tall DataFrame
+        with Driver/Team/LapNumber columns. Built once, then cached, so every
+        metric method can run as a single vectorized filter + groupby instead
+        of a Python loop over drivers and laps.
+        """
+        if self._stacked_tel is None:
+            print("Stacking telemetry for all laps (one-off per session)...")
+
+            def _one_lap(lap):
+                # Single validation point: a lap whose telemetry cannot be
+                # decoded is dropped here, so the metric methods downstream
+                # run without any per-lap exception handling
+                try:
+                    car = self._get_tel(lap)
+                except Exception:
+                    return None
+                return car.assign(
+                    Driver=lap['Driver'], Team=lap['Team'],
+                    LapNumber=int(lap['LapNumber'])
+                )
+
+            lap_rows = [lap for _, lap in self.laps.iterlaps()]
+            if HAS_JOBLIB:
+                frames = Parallel(n_jobs=-1, backend='threading')(
+                    delayed(_one_lap)(lap) for lap in lap_rows
+                )
+            else:
+                frames = [_one_lap(lap) for lap in lap_rows]
+
+            dropped = sum(f is None for f in frames)
+            if dropped:
+                print(f"Warning: Skipped {dropped} laps with unavailable telemetry.")
+
+            frames = [f for f in frames if f is not None]
+            if frames:
+                # Sort by Distance once so every window slice afterwards is
+                # two binary searches instead of a full boolean scan
+                tel = pd.concat(frames, ignore_index=True)
+                self._stacked_tel = tel.sort_values('Distance', ignore_index=True)
+                self._stacked_dist = self._stacked_tel['Distance'].to_numpy()
+            else:
+                self._stacked_tel = pd.DataFrame()
+                self._stacked_dist = np.empty(0)
+        return self._stacked_tel
+
+    def _window(self, lo, hi):
+        """
+        Contiguous slice of the stacked telemetry with lo < Distance < hi.
+        The stack is sorted by Distance, so two np.searchsorted calls find
+        the window in O(log N).
+        """
+        tel = self._all_telemetry()
+        if tel.empty:
+            return tel
+        # Bounds are memoized per (lo, hi): re-analyzing the same corner
+        # (entry + exit metrics, repeated notebook runs) skips the searches
+        key = (float(lo), float(hi))
+        bounds = self._window_cache.get(key)
+        if bounds is None:
+            bounds = (np.searchsorted(self._stacked_dist, lo, side='right'),
+                      np.searchsorted(self._stacked_dist, hi, side='left'))
+            self._window_cache[key] = bounds
+        return tel.iloc[bounds[0]:bounds[1]]
+
+    def _group_reduce(self, zone, by, col, how):
+        """
+        Reduces one telemetry column per group (e.g. per Driver/Team/Lap).
+        how is 'min', 'mean' or 'span' (max - min). Runs on Polars' lazy
+        multi-threaded engine when polars is installed; otherwise factorizes
+        the group key once and hands contiguous NumPy arrays to the
+        single-pass kernels in _kernels, skipping the pandas groupby
+        machinery either way.
+        """
+        if zone.empty:
+            return pd.DataFrame(columns=list(by) + ['Value'])
+
+        if HAS_POLARS:
+            if how == 'span':
+                expr = (pl.col(col).max() - pl.col(col).min()).alias('Value')
+            else:
+                expr = getattr(pl.col(col), how)().alias('Value')
+            lazy = pl.from_pandas(zone[list(by) + [col]]).lazy()
+            return lazy.group_by(list(by)).agg(expr).collect().to_pandas()
+
+        codes, uniques = pd.factorize(pd.MultiIndex.from_frame(zone[by]))
+        order = np.argsort(codes, kind='stable')
+        values = zone[col].to_numpy(dtype=np.float64)[order]
+        starts = np.searchsorted(codes[order], np.arange(len(uniques)))
+
+        # factorize drops the MultiIndex names, so restore the group columns
+        df = uniques.to_frame(index=False).set_axis(list(by), axis=1)
+        df['Value'] = _kernels.GROUP_KERNELS[how](values, starts)
+        return df
+
     def _get_corner_distance(self, corner_number):
         try:
-            val = self.circuit_info.corners.loc[self.circuit_info.corners['Number'] == corner_number, 'Distance']
-            if val.empty:
-                raise ValueError(f"Corner {corner_number} not found.")
-            return val.values[0]
-        except Exception as e:
-            raise ValueError(f"Error finding Corner {corner_number}: {e}")
+            return self._corner_dist[int(corner_number)]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Corner {corner_number} not found.")
 
     def _get_save_name(self, suffix):
         event_name = self.session.event.EventName.replace(" ", "")
@@ -72,7 +282,8 @@ class CircuitAnalyzer:
         session_id = session_type_map.get(self.session.name, self.session.name.replace(" ", ""))
         return f"{event_name}{year}_{session_id}_{suffix}.png"
 
-    def _plot_distribution(self, df, x_col, y_col, title, ylabel, filename_suffix, higher_is_better=False):
+    def _plot_distribution(self, df, x_col, y_col, title, ylabel, filename_suffix,
+                           higher_is_better=False, dpi=150, show=True):
         if df.empty:
             print(f"No data available to plot for {title}")
             return
@@ -82,268 +293,350 @@ class CircuitAnalyzer:
             order = medians.sort_values(ascending=False).index
         else:
             order = medians.sort_values(ascending=True).index
-        
-        palette = {driver: self.team_colors.get(team, '#CCCCCC') 
-                   for driver, team in zip(df[x_col], df['Team'])}
 
-        plt.figure(figsize=(16, 8))
-        sns.boxplot(
-            data=df, x=x_col, y=y_col, order=order, palette=palette,
-            whis=1.5, fliersize=3, linewidth=1.2
+        # One palette entry per plotted category, not per row of the frame
+        palette = {drv: self._driver_palette.get(drv, '#CCCCCC') for drv in order}
+
+        # Five-number summary per driver, computed once; ax.bxp draws the
+        # boxes directly instead of seaborn re-deriving quartiles and
+        # whiskers from the raw per-row frame
+        grouped = df.groupby(x_col)[y_col]
+        q1 = grouped.quantile(0.25)
+        q3 = grouped.quantile(0.75)
+        iqr = q3 - q1
+
+        stats = []
+        for drv in order:
+            vals = grouped.get_group(drv).to_numpy()
+            lo_f, hi_f = q1[drv] - 1.5 * iqr[drv], q3[drv] + 1.5 * iqr[drv]
+            inside = vals[(vals >= lo_f) & (vals <= hi_f)]
+            whislo = inside.min() if len(inside) else q1[drv]
+            whishi = inside.max() if len(inside) else q3[drv]
+            stats.append({
+                'label': drv, 'med': medians[drv], 'q1': q1[drv], 'q3': q3[drv],
+                'whislo': whislo, 'whishi': whishi,
+                'fliers': vals[(vals < whislo) | (vals > whishi)],
+            })
+
+        # Explicit figure handle so batch runs (show=False) can close it and
+        # release the render memory instead of leaving it on pyplot's stack
+        fig, ax = plt.subplots(figsize=(16, 8))
+        bxp = ax.bxp(
+            stats, showfliers=True, patch_artist=True, widths=0.6,
+            flierprops={'marker': 'o', 'markersize': 3},
+            medianprops={'color': 'white'},
+            boxprops={'linewidth': 1.2}, whiskerprops={'linewidth': 1.2}
         )
-        
+        for patch, drv in zip(bxp['boxes'], order):
+            patch.set_facecolor(palette[drv])
+
         arrow_text = "← Better (Higher)" if higher_is_better else "← Better (Lower)"
-        plt.annotate(arrow_text, xy=(0, 1.01), xycoords='axes fraction', fontsize=10, 
-                     color='gray', fontstyle='italic')
-
-        plt.title(f"{title}\n{self.session.event.year} {self.session.event.EventName}", fontsize=16)
-        plt.xlabel("Driver", fontsize=12)
-        plt.ylabel(ylabel, fontsize=12)
-        plt.grid(True, which='both', axis='y', linestyle='--', linewidth=0.5, alpha=0.3)
-        sns.despine(offset=10, trim=True)
-        
+        ax.annotate(arrow_text, xy=(0, 1.01), xycoords='axes fraction', fontsize=10,
+                    color='gray', fontstyle='italic')
+
+        ax.set_title(f"{title}\n{self.session.event.year} {self.session.event.EventName}", fontsize=16)
+        ax.set_xlabel("Driver", fontsize=12)
+        ax.set_ylabel(ylabel, fontsize=12)
+        ax.grid(True, which='both', axis='y', linestyle='--', linewidth=0.5, alpha=0.3)
+        sns.despine(ax=ax, offset=10, trim=True)
+
         filename = self._get_save_name(filename_suffix)
-        plt.tight_layout()
-        plt.savefig(filename, dpi=300)
+        fig.tight_layout()
+        fig.savefig(filename, dpi=dpi)
         print(f"Plot saved to {filename}")
-        plt.show()
+        if show:
+            plt.show()
+        else:
+            plt.close(fig)
+
+    def corner_report(self, corner_number, distance_after=100, dpi=150, show=True):
+        """
+        Computes all four single-corner metrics (braking distance, apex
+        speed, exit speed, throttle commitment) from ONE slice of the
+        stacked telemetry instead of four separate passes over it, then
+        plots each distribution. Returns the combined long DataFrame with
+        a Metric column.
+        """
+        print(f"Building full corner report for Turn {corner_number}...")
+        center_dist = self._get_corner_distance(corner_number)
+
+        # One wide slice covers every metric window below; the exit-speed
+        # window sits at distance_after, so grow the far edge with it
+        wide = self._window(center_dist - 250,
+                            center_dist + max(300, distance_after + 10))
+        if wide.empty:
+            print("No telemetry available.")
+            return None
+
+        dist = wide['Distance'].to_numpy()
+
+        def sub(lo, hi):
+            return wide.iloc[np.searchsorted(dist, lo, side='right'):
+                             np.searchsorted(dist, hi, side='left')]
+
+        results = []
+
+        # Entry: braking span (-250m .. +50m)
+        braking = sub(center_dist - 250, center_dist + 50)
+        braking = braking.loc[braking['Brake'] >= 1]
+        spans = self._group_reduce(braking, ['Driver', 'Team', 'LapNumber'],
+                                   'Distance', 'span')
+        spans = spans.loc[(spans['Value'] > 10) & (spans['Value'] < 250)]
+        results.append(spans.assign(Metric='BrakingDist'))
+
+        # Entry: apex (min) speed (+/- 20m)
+        apex = self._group_reduce(sub(center_dist - 20, center_dist + 20),
+                                  ['Driver', 'Team', 'LapNumber'],
+                                  'Speed', 'min')
+        results.append(apex.assign(Metric='ApexSpeed'))
+
+        # Exit: mean speed around +distance_after
+        exit_zone = sub(center_dist + distance_after - 10, center_dist + distance_after + 10)
+        exit_speed = self._group_reduce(exit_zone, ['Driver', 'Team', 'LapNumber'],
+                                        'Speed', 'mean')
+        results.append(exit_speed.assign(Metric='ExitSpeed'))
+
+        # Exit: distance to full throttle (0 .. +300m)
+        thr = sub(center_dist, center_dist + 300)
+        thr = thr.loc[thr['Throttle'] >= 99]
+        commit = self._group_reduce(thr, ['Driver', 'Team', 'LapNumber'],
+                                    'Distance', 'min')
+        commit['Value'] = commit['Value'] - center_dist
+        results.append(commit.assign(Metric='ThrottleCommit'))
+
+        report = pd.concat(results, ignore_index=True)
+
+        plots = {
+            'BrakingDist': (f"Turn {corner_number} Braking Distance",
+                            "Braking Distance (m)", f"T{corner_number}_Braking", False),
+            'ApexSpeed': (f"Turn {corner_number} Apex (Min) Speed",
+                          "Speed (km/h)", f"T{corner_number}_ApexSpeed", True),
+            'ExitSpeed': (f"Turn {corner_number} Exit Speed (+{distance_after}m)",
+                          "Speed (km/h)", f"T{corner_number}_ExitSpeed", True),
+            'ThrottleCommit': (f"Turn {corner_number} Distance to Full Throttle",
+                               "Meters after Apex", f"T{corner_number}_ThrottleCommit", False),
+        }
+        for metric, (title, ylabel, suffix, higher) in plots.items():
+            self._plot_distribution(
+                report.loc[report['Metric'] == metric], 'Driver', 'Value',
+                title, ylabel, suffix, higher_is_better=higher, dpi=dpi, show=show
+            )
+        return report
+
+    def run(self, results, dpi=150, show=True):
+        """
+        Materializes and plots a batch of deferred MetricResults (built with
+        defer=True). The first result pays for the telemetry stacking; the
+        rest reuse it.
+        """
+        for result in results:
+            result.plot(dpi=dpi, show=show)
+        return results
 
 class EntryPhase:
     def __init__(self, parent):
         self.parent = parent
 
-    def braking_dist(self, corner_number):
+    def braking_dist(self, corner_number, defer=False):
         print(f"Analyzing Braking Distance for Turn {corner_number}...")
         center_dist = self.parent._get_corner_distance(corner_number)
         start_w, end_w = center_dist - 250, center_dist + 50
-        
-        data = []
-        for drv in self.parent.session.drivers:
-            drv_laps = self.parent.laps.pick_drivers(drv)
-            if drv_laps.empty: continue
-            
-            driver_info = self.parent.session.get_driver(drv)
-            driver_code = driver_info['Abbreviation']
-            team_name = drv_laps.iloc[0]['Team']
-
-            for _, lap in drv_laps.iterlaps():
-                try:
-                    car = lap.get_car_data().add_distance()
-                    mask = (car['Distance'] > start_w) & (car['Distance'] < end_w)
-                    zone = car.loc[mask]
-                    braking = zone[zone['Brake'] >= 1]
-                    if not braking.empty:
-                        b_dist = braking['Distance'].max() - braking['Distance'].min()
-                        if 10 < b_dist < 250:
-                            data.append({'Driver': driver_code, 'Team': team_name, 'Value': b_dist})
-                except Exception: continue
-
-        df = pd.DataFrame(data)
-        self.parent._plot_distribution(
-            df, 'Driver', 'Value', f"Turn {corner_number} Braking Distance", 
+
+        def compute():
+            zone = self.parent._window(start_w, end_w)
+            braking = zone.loc[zone['Brake'] >= 1] if not zone.empty else zone
+            spans = self.parent._group_reduce(braking, ['Driver', 'Team', 'LapNumber'],
+                                              'Distance', 'span')
+            # Only include valid braking zones (e.g. not lifting for 5m)
+            return spans.loc[(spans['Value'] > 10) & (spans['Value'] < 250)]
+
+        result = MetricResult(
+            self.parent, compute, f"Turn {corner_number} Braking Distance",
             "Braking Distance (m)", f"T{corner_number}_Braking", higher_is_better=False
         )
+        if defer:
+            return result
+        result.plot()
 
-    def velo_dist(self, corner_number):
+    def velo_dist(self, corner_number, defer=False):
         print(f"Analyzing Entry/Apex Velocity for Turn {corner_number}...")
         center_dist = self.parent._get_corner_distance(corner_number)
         start_w, end_w = center_dist - 20, center_dist + 20
-        
-        data = []
-        for drv in self.parent.session.drivers:
-            drv_laps = self.parent.laps.pick_drivers(drv)
-            if drv_laps.empty: continue
-            
-            driver_code = self.parent.session.get_driver(drv)
-            team_name = drv_laps.iloc[0]['Team']
-
-            for _, lap in drv_laps.iterlaps():
-                try:
-                    car = lap.get_car_data().add_distance()
-                    mask = (car['Distance'] > start_w) & (car['Distance'] < end_w)
-                    zone = car.loc[mask]
-                    if not zone.empty:
-                        min_speed = zone['Speed'].min()
-                        data.append({'Driver': driver_code['Abbreviation'], 'Team': team_name, 'Value': min_speed})
-                except Exception: continue
-
-        df = pd.DataFrame(data)
-        self.parent._plot_distribution(
-            df, 'Driver', 'Value', f"Turn {corner_number} Apex (Min) Speed", 
+
+        def compute():
+            zone = self.parent._window(start_w, end_w)
+            return self.parent._group_reduce(zone, ['Driver', 'Team', 'LapNumber'],
+                                             'Speed', 'min')
+
+        result = MetricResult(
+            self.parent, compute, f"Turn {corner_number} Apex (Min) Speed",
             "Speed (km/h)", f"T{corner_number}_ApexSpeed", higher_is_better=True
         )
+        if defer:
+            return result
+        result.plot()
+
+    def braking_dist_all(self, dpi=150, show=True):
+        """
+        Braking-distance distributions for EVERY corner in one pass: the
+        stacked telemetry is labelled with its braking window once, then a
+        single grouped reduction feeds all per-corner plots.
+        """
+        print("Analyzing Braking Distance for all corners...")
+        tel = self.parent._all_telemetry()
+        if tel.empty:
+            print("No telemetry available.")
+            return None
+
+        idx = self.parent._brake_intervals.get_indexer(tel['Distance'].to_numpy())
+        mask = (idx >= 0) & (tel['Brake'].to_numpy() >= 1)
+        braking = tel.loc[mask].assign(CornerIdx=idx[mask])
+
+        spans = self.parent._group_reduce(braking, ['Driver', 'Team', 'LapNumber', 'CornerIdx'],
+                                          'Distance', 'span')
+        # Only include valid braking zones (e.g. not lifting for 5m)
+        spans = spans.loc[(spans['Value'] > 10) & (spans['Value'] < 250)]
+
+        for corner_idx, df in spans.groupby('CornerIdx'):
+            corner_number = self.parent._corner_numbers[int(corner_idx)]
+            self.parent._plot_distribution(
+                df, 'Driver', 'Value', f"Turn {corner_number} Braking Distance",
+                "Braking Distance (m)", f"T{corner_number}_Braking",
+                higher_is_better=False, dpi=dpi, show=show
+            )
+        return spans
+
+    def velo_dist_all(self, dpi=150, show=True):
+        """
+        Apex-speed distributions for EVERY corner in one pass, analogous to
+        braking_dist_all.
+        """
+        print("Analyzing Apex Speed for all corners...")
+        tel = self.parent._all_telemetry()
+        if tel.empty:
+            print("No telemetry available.")
+            return None
+
+        idx = self.parent._apex_intervals.get_indexer(tel['Distance'].to_numpy())
+        zone = tel.loc[idx >= 0].assign(CornerIdx=idx[idx >= 0])
+
+        per_corner = self.parent._group_reduce(zone, ['Driver', 'Team', 'LapNumber', 'CornerIdx'],
+                                               'Speed', 'min')
+
+        for corner_idx, df in per_corner.groupby('CornerIdx'):
+            corner_number = self.parent._corner_numbers[int(corner_idx)]
+            self.parent._plot_distribution(
+                df, 'Driver', 'Value', f"Turn {corner_number} Apex (Min) Speed",
+                "Speed (km/h)", f"T{corner_number}_ApexSpeed",
+                higher_is_better=True, dpi=dpi, show=show
+            )
+        return per_corner
 
 class ExitPhase:
     def __init__(self, parent):
         self.parent = parent
 
-    def velo_dist(self, corner_number, distance_after=100):
+    def velo_dist(self, corner_number, distance_after=100, defer=False):
         print(f"Analyzing Exit Velocity for Turn {corner_number} (+{distance_after}m)...")
         center_dist = self.parent._get_corner_distance(corner_number)
         target_dist = center_dist + distance_after
         start_w, end_w = target_dist - 10, target_dist + 10
-        
-        data = []
-        for drv in self.parent.session.drivers:
-            drv_laps = self.parent.laps.pick_drivers(drv)
-            if drv_laps.empty: continue
-            
-            driver_code = self.parent.session.get_driver(drv)
-            team_name = drv_laps.iloc[0]['Team']
-
-            for _, lap in drv_laps.iterlaps():
-                try:
-                    car = lap.get_car_data().add_distance()
-                    mask = (car['Distance'] > start_w) & (car['Distance'] < end_w)
-                    zone = car.loc[mask]
-                    if not zone.empty:
-                        speed = zone['Speed'].mean()
-                        data.append({'Driver': driver_code['Abbreviation'], 'Team': team_name, 'Value': speed})
-                except Exception: continue
-
-        df = pd.DataFrame(data)
-        self.parent._plot_distribution(
-            df, 'Driver', 'Value', f"Turn {corner_number} Exit Speed (+{distance_after}m)", 
+
+        def compute():
+            zone = self.parent._window(start_w, end_w)
+            return self.parent._group_reduce(zone, ['Driver', 'Team', 'LapNumber'],
+                                             'Speed', 'mean')
+
+        result = MetricResult(
+            self.parent, compute, f"Turn {corner_number} Exit Speed (+{distance_after}m)",
             "Speed (km/h)", f"T{corner_number}_ExitSpeed", higher_is_better=True
         )
+        if defer:
+            return result
+        result.plot()
 
-    def throttle_commit(self, corner_number):
+    def throttle_commit(self, corner_number, defer=False):
         print(f"Analyzing Full Throttle Commitment for Turn {corner_number}...")
         center_dist = self.parent._get_corner_distance(corner_number)
         start_w, end_w = center_dist, center_dist + 300
-        
-        data = []
-        for drv in self.parent.session.drivers:
-            drv_laps = self.parent.laps.pick_drivers(drv)
-            if drv_laps.empty: continue
-            
-            driver_code = self.parent.session.get_driver(drv)
-            team_name = drv_laps.iloc[0]['Team']
-
-            for _, lap in drv_laps.iterlaps():
-                try:
-                    car = lap.get_car_data().add_distance()
-                    mask = (car['Distance'] > start_w) & (car['Distance'] < end_w)
-                    zone = car.loc[mask]
-                    full_throttle = zone[zone['Throttle'] >= 99]
-                    if not full_throttle.empty:
-                        dist_to_full = full_throttle['Distance'].min() - center_dist
-                        data.append({'Driver': driver_code['Abbreviation'], 'Team': team_name, 'Value': dist_to_full})
-                except Exception: continue
-
-        df = pd.DataFrame(data)
-        self.parent._plot_distribution(
-            df, 'Driver', 'Value', f"Turn {corner_number} Distance to Full Throttle", 
+
+        def compute():
+            zone = self.parent._window(start_w, end_w)
+            full_throttle = zone.loc[zone['Throttle'] >= 99] if not zone.empty else zone
+            df = self.parent._group_reduce(full_throttle, ['Driver', 'Team', 'LapNumber'],
+                                           'Distance', 'min')
+            df['Value'] = df['Value'] - center_dist
+            return df
+
+        result = MetricResult(
+            self.parent, compute, f"Turn {corner_number} Distance to Full Throttle",
             "Meters after Apex", f"T{corner_number}_ThrottleCommit", higher_is_better=False
         )
+        if defer:
+            return result
+        result.plot()
 
 class AllPhase:
     def __init__(self, parent):
         self.parent = parent
 
-    def velo_dist(self):
+    def velo_dist(self, defer=False):
         """
         Calculates the Average Minimum (Apex) Speed across ALL corners for each lap.
         """
         print("Analyzing Average Apex Speed across ALL corners...")
-        
-        # Get all corner distances
-        corners = self.parent.circuit_info.corners
-        corner_distances = corners['Distance'].tolist()
-        
-        data = []
-        
-        for drv in self.parent.session.drivers:
-            drv_laps = self.parent.laps.pick_drivers(drv)
-            if drv_laps.empty: continue
-            
-            driver_code = self.parent.session.get_driver(drv)['Abbreviation']
-            team_name = drv_laps.iloc[0]['Team']
-
-            for _, lap in drv_laps.iterlaps():
-                try:
-                    # Get telemetry once per lap to optimize speed
-                    car = lap.get_car_data().add_distance()
-                    
-                    apex_speeds = []
-                    
-                    for dist in corner_distances:
-                        # Window: +/- 20m around apex
-                        start_w, end_w = dist - 20, dist + 20
-                        
-                        mask = (car['Distance'] > start_w) & (car['Distance'] < end_w)
-                        zone = car.loc[mask]
-                        
-                        if not zone.empty:
-                            apex_speeds.append(zone['Speed'].min())
-                    
-                    # Calculate average apex speed for this lap
-                    if apex_speeds:
-                        avg_apex_speed = np.mean(apex_speeds)
-                        data.append({'Driver': driver_code, 'Team': team_name, 'Value': avg_apex_speed})
-                        
-                except Exception:
-                    continue
-
-        df = pd.DataFrame(data)
-        self.parent._plot_distribution(
-            df, 'Driver', 'Value', 
-            "Average Apex Speed (All Corners)", 
-            "Average Speed (km/h)", 
-            "AllCorners_ApexSpeed",
-            higher_is_better=True
+
+        def compute():
+            tel = self.parent._all_telemetry()
+            if tel.empty:
+                return pd.DataFrame(columns=['Driver', 'Team', 'LapNumber', 'Value'])
+
+            # One get_indexer() call labels every sample with its apex window
+            # (+/- 20m around each corner); -1 means outside every window
+            idx = self.parent._apex_intervals.get_indexer(tel['Distance'].to_numpy())
+            zone = tel.loc[idx >= 0].assign(CornerIdx=idx[idx >= 0])
+
+            # Min speed per lap in each corner window, then average across corners
+            per_corner = self.parent._group_reduce(zone, ['Driver', 'Team', 'LapNumber', 'CornerIdx'],
+                                                   'Speed', 'min')
+            return per_corner.groupby(['Driver', 'Team', 'LapNumber'])['Value'].mean().reset_index()
+
+        result = MetricResult(
+            self.parent, compute, "Average Apex Speed (All Corners)",
+            "Average Speed (km/h)", "AllCorners_ApexSpeed", higher_is_better=True
         )
+        if defer:
+            return result
+        result.plot()
 
-    def braking_dist(self):
+    def braking_dist(self, defer=False):
         """
         Calculates the Average Braking Distance across ALL braking zones for each lap.
         """
         print("Analyzing Average Braking Distance across ALL corners...")
-        
-        corners = self.parent.circuit_info.corners
-        corner_distances = corners['Distance'].tolist()
-        
-        data = []
-        
-        for drv in self.parent.session.drivers:
-            drv_laps = self.parent.laps.pick_drivers(drv)
-            if drv_laps.empty: continue
-            
-            driver_code = self.parent.session.get_driver(drv)['Abbreviation']
-            team_name = drv_laps.iloc[0]['Team']
-
-            for _, lap in drv_laps.iterlaps():
-                try:
-                    car = lap.get_car_data().add_distance()
-                    braking_dists = []
-                    
-                    for dist in corner_distances:
-                        # Look for braking 250m before to 50m after corner
-                        start_w, end_w = dist - 250, dist + 50
-                        
-                        mask = (car['Distance'] > start_w) & (car['Distance'] < end_w)
-                        zone = car.loc[mask]
-                        
-                        braking = zone[zone['Brake'] >= 1]
-                        if not braking.empty:
-                            b_dist = braking['Distance'].max() - braking['Distance'].min()
-                            # Only include valid braking zones (e.g. not lifting for 5m)
-                            if 10 < b_dist < 250:
-                                braking_dists.append(b_dist)
-                    
-                    # Calculate average braking distance for this lap
-                    if braking_dists:
-                        avg_brake_dist = np.mean(braking_dists)
-                        data.append({'Driver': driver_code, 'Team': team_name, 'Value': avg_brake_dist})
-                        
-                except Exception:
-                    continue
-
-        df = pd.DataFrame(data)
-        self.parent._plot_distribution(
-            df, 'Driver', 'Value', 
-            "Average Braking Distance (All Corners)", 
-            "Avg Distance (m)", 
-            "AllCorners_BrakingDist",
-            higher_is_better=False
-        )
\ No newline at end of file
+
+        def compute():
+            tel = self.parent._all_telemetry()
+            if tel.empty:
+                return pd.DataFrame(columns=['Driver', 'Team', 'LapNumber', 'Value'])
+
+            # One get_indexer() call labels every sample with its braking window
+            # (-250m .. +50m around each corner, clipped so windows stay disjoint)
+            idx = self.parent._brake_intervals.get_indexer(tel['Distance'].to_numpy())
+            mask = (idx >= 0) & (tel['Brake'].to_numpy() >= 1)
+            braking = tel.loc[mask].assign(CornerIdx=idx[mask])
+
+            # Braking span per lap in each corner window, then average across corners
+            spans = self.parent._group_reduce(braking, ['Driver', 'Team', 'LapNumber', 'CornerIdx'],
+                                              'Distance', 'span')
+            # Only include valid braking zones (e.g. not lifting for 5m)
+            valid = spans.loc[(spans['Value'] > 10) & (spans['Value'] < 250)]
+            return valid.groupby(['Driver', 'Team', 'LapNumber'])['Value'].mean().reset_index()
+
+        result = MetricResult(
+            self.parent, compute, "Average Braking Distance (All Corners)",
+            "Avg Distance (m)", "AllCorners_BrakingDist", higher_is_better=False
+        )
+        if defer:
+            return result
+        result.plot()
\ No newline at end of file
@@ -7,6 +7,8 @@ import numpy as np
 import json
 import os
 
+from . import _kernels
+
 # Apply FastF1 styling
 try:
     fastf1.plotting.setup_mpl()
@@ -34,7 +36,23 @@ class StraightAnalyzer:
         print("Initializing StraightAnalyzer: Pre-filtering laps...")
         self.laps = session.laps.pick_quicklaps().pick_wo_box()
         self.circuit_info = session.get_circuit_info()
-        
+
+        # Corner number -> distance lookup, built once for O(1) access
+        self._corner_dist = dict(zip(self.circuit_info.corners['Number'].to_numpy(),
+                                     self.circuit_info.corners['Distance'].to_numpy()))
+
+        # Telemetry cache keyed by (driver, lap number): repeat V-Max/accel
+        # analyses reuse the same distance-augmented frame, and the hot
+        # columns are kept as plain NumPy arrays for mask-free slicing
+        self._tel_cache = {}
+        self._arr_cache = {}
+        self._stacked_tel = None
+
+        # One get_driver call per driver; FastF1 scans its driver list on
+        # every lookup, so the hot loops read these dicts instead
+        self._driver_info = {d: session.get_driver(d) for d in session.drivers}
+        self._driver_abbr = {d: info['Abbreviation'] for d, info in self._driver_info.items()}
+
         # Initialize Sub-modules
         self.speed = SpeedPhase(self)
         self.accel = AccelPhase(self)
@@ -50,14 +68,60 @@ class StraightAnalyzer:
             print(f"Warning: Could not load team_colors.json. {e}")
             return {}
 
+    def _get_car_distance(self, lap):
+        """Returns the distance-augmented car data for a lap, cached per (driver, lap)."""
+        key = (lap['Driver'], int(lap['LapNumber']))
+        car = self._tel_cache.get(key)
+        if car is None:
+            car = lap.get_car_data().add_distance()
+            self._tel_cache[key] = car
+            self._arr_cache[key] = {'Distance': car['Distance'].to_numpy(),
+                                    'Speed': car['Speed'].to_numpy(),
+                                    'Throttle': car['Throttle'].to_numpy(),
+                                    'Time': car['Time'].to_numpy().astype('int64')}
+        return car
+
+    def _get_arrays(self, lap):
+        """NumPy column views of a lap's cached telemetry."""
+        key = (lap['Driver'], int(lap['LapNumber']))
+        if key not in self._arr_cache:
+            self._get_car_distance(lap)
+        return self._arr_cache[key]
+
+    def _all_telemetry(self):
+        """Car telemetry for every quick lap stacked into one frame, built once."""
+        if self._stacked_tel is not None:
+            return self._stacked_tel
+
+        frames = []
+        for drv in self.session.drivers:
+            drv_laps = self.laps.pick_drivers(drv)
+            if drv_laps.empty:
+                continue
+
+            driver_code = self._driver_abbr[drv]
+            team_name = drv_laps.iloc[0]['Team']
+
+            for _, lap in drv_laps.iterlaps():
+                try:
+                    car = self._get_car_distance(lap)
+                    frames.append(car.assign(Driver=driver_code, Team=team_name,
+                                             LapKey=int(lap['LapNumber'])))
+                except Exception:
+                    continue
+
+        if frames:
+            self._stacked_tel = pd.concat(frames, ignore_index=True, copy=False)
+        else:
+            self._stacked_tel = pd.DataFrame(
+                columns=['Driver', 'Team', 'LapKey', 'Distance', 'Speed'])
+        return self._stacked_tel
+
     def _get_corner_distance(self, corner_number):
         try:
-            val = self.circuit_info.corners.loc[self.circuit_info.corners['Number'] == corner_number, 'Distance']
-            if val.empty:
-                raise ValueError(f"Corner {corner_number} not found.")
-            return val.values[0]
-        except Exception as e:
-            raise ValueError(f"Error finding Corner {corner_number}: {e}")
+            return self._corner_dist[corner_number]
+        except KeyError:
+            raise ValueError(f"Corner {corner_number} not found.")
 
     def _get_save_name(self, suffix):
         event_name = self.session.event.EventName.replace(" ", "")
@@ -70,7 +134,7 @@ class StraightAnalyzer:
         session_id = session_type_map.get(self.session.name, self.session.name.replace(" ", ""))
         return f"{event_name}{year}_{session_id}_{suffix}.png"
 
-    def _plot_distribution(self, df, x_col, y_col, title, ylabel, filename_suffix, higher_is_better=True):
+    def _plot_distribution(self, df, x_col, y_col, title, ylabel, filename_suffix, higher_is_better=True, dpi=150):
         if df.empty:
             print(f"No data available to plot for {title}")
             return
@@ -81,28 +145,36 @@ class StraightAnalyzer:
         else:
             order = medians.sort_values(ascending=True).index
         
-        palette = {driver: self.team_colors.get(team, '#CCCCCC') 
-                   for driver, team in zip(df[x_col], df['Team'])}
+        # Dedupe before mapping: the frame has thousands of rows but only
+        # ~20 driver/team pairs to color
+        driver_team = df[[x_col, 'Team']].drop_duplicates()
+        palette = dict(zip(driver_team[x_col],
+                           driver_team['Team'].map(self.team_colors).fillna('#CCCCCC')))
+
+        # Boxplot straight from NumPy arrays: seaborn would re-group the
+        # frame internally to recompute the quartiles we already ordered by
+        per_driver = [df.loc[df[x_col] == d, y_col].to_numpy() for d in order]
+
+        fig, ax = plt.subplots(figsize=(16, 8))
+        bp = ax.boxplot(per_driver, tick_labels=list(order), whis=1.5, showfliers=True,
+                        flierprops={'markersize': 3}, widths=0.6,
+                        patch_artist=True, medianprops={'color': 'white'})
+        for box, drv in zip(bp['boxes'], order):
+            box.set_facecolor(palette.get(drv, '#CCCCCC'))
 
-        plt.figure(figsize=(16, 8))
-        sns.boxplot(
-            data=df, x=x_col, y=y_col, order=order, palette=palette,
-            whis=1.5, fliersize=3, linewidth=1.2
-        )
-        
         arrow_text = "← Better (Higher)" if higher_is_better else "← Better (Lower)"
-        plt.annotate(arrow_text, xy=(0, 1.01), xycoords='axes fraction', fontsize=10, 
-                     color='gray', fontstyle='italic')
+        ax.annotate(arrow_text, xy=(0, 1.01), xycoords='axes fraction', fontsize=10,
+                    color='gray', fontstyle='italic')
 
-        plt.title(f"{title}\n{self.session.event.year} {self.session.event.EventName}", fontsize=16)
-        plt.xlabel("Driver", fontsize=12)
-        plt.ylabel(ylabel, fontsize=12)
-        plt.grid(True, which='both', axis='y', linestyle='--', linewidth=0.5, alpha=0.3)
+        ax.set_title(f"{title}\n{self.session.event.year} {self.session.event.EventName}", fontsize=16)
+        ax.set_xlabel("Driver", fontsize=12)
+        ax.set_ylabel(ylabel, fontsize=12)
+        ax.grid(True, which='both', axis='y', linestyle='--', linewidth=0.5, alpha=0.3)
         sns.despine(offset=10, trim=True)
         
         filename = self._get_save_name(filename_suffix)
         plt.tight_layout()
-        plt.savefig(filename, dpi=300)
+        plt.savefig(filename, dpi=dpi)
         print(f"Plot saved to {filename}")
         plt.show()
 
@@ -110,7 +182,7 @@ class SpeedPhase:
     def __init__(self, parent):
         self.parent = parent
 
-    def vmax_dist(self, start_turn, end_turn):
+    def vmax_dist(self, start_turn, end_turn, dpi=150):
         """
         Calculates the Maximum Speed reached between two corners.
         Example: Vegas Strip is usually Turn 12 to Turn 14.
@@ -130,48 +202,36 @@ class SpeedPhase:
             crosses_finish = True
             print("Note: Segment crosses the finish line.")
         
-        data = []
-        for drv in self.parent.session.drivers:
-            drv_laps = self.parent.laps.pick_drivers(drv)
-            if drv_laps.empty: continue
-            
-            driver_code = self.parent.session.get_driver(drv)['Abbreviation']
-            team_name = drv_laps.iloc[0]['Team']
+        # One mask + one grouped max over the stacked telemetry replaces
+        # the per-lap loop: every lap's zone is reduced in a single batch
+        tel = self.parent._all_telemetry()
+        if tel.empty:
+            print("No telemetry available.")
+            return
 
-            for _, lap in drv_laps.iterlaps():
-                try:
-                    # Get telemetry
-                    car = lap.get_car_data().add_distance()
-                    
-                    # Slice the straight
-                    if crosses_finish:
-                        mask = (car['Distance'] > start_dist) | (car['Distance'] < end_dist)
-                    else:
-                        mask = (car['Distance'] > start_dist) & (car['Distance'] < end_dist)
-                        
-                    zone = car.loc[mask]
-                    
-                    if not zone.empty:
-                        # Max speed in this zone
-                        v_max = zone['Speed'].max()
-                        data.append({'Driver': driver_code, 'Team': team_name, 'Value': v_max})
-                except Exception:
-                    continue
+        dist = tel['Distance'].to_numpy()
+        if crosses_finish:
+            # Zone wraps the line: after the start corner OR before the end
+            mask = (dist > start_dist) | (dist < end_dist)
+        else:
+            mask = (dist > start_dist) & (dist < end_dist)
 
-        df = pd.DataFrame(data)
+        zone = tel.loc[mask, ['Driver', 'Team', 'LapKey', 'Speed']]
+        df = (zone.groupby(['Driver', 'Team', 'LapKey'], observed=True)['Speed']
+                  .max().reset_index().rename(columns={'Speed': 'Value'}))
         self.parent._plot_distribution(
             df, 'Driver', 'Value', 
             f"V-Max Distribution (Turn {start_turn} -> {end_turn})", 
             "Speed (km/h)", 
             f"Straight_VMax_T{start_turn}_T{end_turn}",
-            higher_is_better=True
+            higher_is_better=True, dpi=dpi
         )
 
 class AccelPhase:
     def __init__(self, parent):
         self.parent = parent
 
-    def time_to_speed(self, start_speed, end_speed, after_turn):
+    def time_to_speed(self, start_speed, end_speed, after_turn, dpi=150):
         """
         Calculates the time taken to accelerate from start_speed to end_speed.
         Starts searching immediately after the specific corner.
@@ -189,50 +249,43 @@ class AccelPhase:
         search_start = corner_dist
         search_end = corner_dist + 1000
         
-        data = []
+        # Parallel column lists: cheaper to build than per-row dicts
+        drivers, teams, values = [], [], []
         for drv in self.parent.session.drivers:
             drv_laps = self.parent.laps.pick_drivers(drv)
             if drv_laps.empty: continue
             
-            driver_code = self.parent.session.get_driver(drv)['Abbreviation']
+            driver_code = self.parent._driver_abbr[drv]
             team_name = drv_laps.iloc[0]['Team']
 
             for _, lap in drv_laps.iterlaps():
                 try:
-                    car = lap.get_car_data().add_distance()
-                    
-                    # 1. Slice to the area after the corner
-                    mask = (car['Distance'] > search_start) & (car['Distance'] < search_end)
-                    zone = car.loc[mask]
-                    
-                    if zone.empty: continue
-                    
-                    # 2. Find timestamp where we pass Start Speed
-                    start_points = zone[zone['Speed'] >= start_speed]
-                    if start_points.empty: continue
-                    t_start = start_points.iloc[0]['Time']
-                    
-                    # 3. Find timestamp where we pass End Speed
-                    # We only look at points AFTER the start point
-                    end_points = zone[(zone['Speed'] >= end_speed) & (zone['Time'] > t_start)]
-                    if end_points.empty: continue
-                    t_end = end_points.iloc[0]['Time']
-                    
-                    # 4. Calculate Delta
-                    delta_seconds = (t_end - t_start).total_seconds()
-                    
+                    arr = self.parent._get_arrays(lap)
+
+                    # Compiled scan for the v0 -> v1 crossing inside the
+                    # window, replacing the three pandas slicing steps
+                    delta_seconds = _kernels.find_accel_delta(
+                        arr['Distance'], arr['Speed'], arr['Time'],
+                        float(search_start), float(search_end),
+                        float(start_speed), float(end_speed)
+                    )
+                    if not np.isfinite(delta_seconds):
+                        continue
+
                     # Sanity check (e.g., if it took 10 seconds to go 100-200, they probably lifted)
                     if 0.5 < delta_seconds < 8.0:
-                        data.append({'Driver': driver_code, 'Team': team_name, 'Value': delta_seconds})
+                        drivers.append(driver_code)
+                        teams.append(team_name)
+                        values.append(delta_seconds)
 
                 except Exception:
                     continue
 
-        df = pd.DataFrame(data)
+        df = pd.DataFrame({'Driver': drivers, 'Team': teams, 'Value': values})
         self.parent._plot_distribution(
             df, 'Driver', 'Value', 
             f"Acceleration Time ({start_speed}-{end_speed} kph) after Turn {after_turn}", 
             "Time (seconds)", 
             f"Straight_Accel_T{after_turn}",
-            higher_is_better=False # Lower time is better
+            higher_is_better=False, dpi=dpi # Lower time is better
         )
\ No newline at end of file
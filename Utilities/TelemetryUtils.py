@@ -3,10 +3,13 @@ import fastf1.plotting
 import fastf1.utils
 import seaborn as sns
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 import pandas as pd
 import numpy as np
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Apply FastF1 default styling
@@ -15,6 +18,14 @@ try:
 except Exception:
     pass
 
+# pyarrow is optional: with it installed exports default to Parquet, which
+# writes much faster and far smaller than CSV thanks to columnar encoding.
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except Exception:
+    HAS_PYARROW = False
+
 class TelemetryAnalyzer:
     """
     Micro-level analysis of Car Physics and Line Traces.
@@ -38,6 +49,15 @@ class TelemetryAnalyzer:
         # but the export function handles all laps independently.
         self.laps = session.laps.pick_quicklaps().pick_wo_box()
 
+        # Fastest-lap cache keyed by driver: consecutive comparison plots
+        # for the same drivers reuse the lap and its car data
+        self._fastest_cache = {}
+
+        # One get_driver call per driver; FastF1 scans its driver list on
+        # every lookup, so the export loop reads these dicts instead
+        self._driver_info = {d: session.get_driver(d) for d in session.drivers}
+        self._driver_abbr = {d: info['Abbreviation'] for d, info in self._driver_info.items()}
+
     def _load_default_colors(self):
         """Loads team_colors.json from the same directory as this script."""
         try:
@@ -61,55 +81,96 @@ class TelemetryAnalyzer:
         session_id = session_type_map.get(self.session.name, self.session.name.replace(" ", ""))
         return f"{event_name}{year}_{session_id}_{suffix}"
 
-    def export_to_csv(self, output_folder="telemetry_data"):
+    def _get_fastest(self, drv):
+        """Fastest quick lap and its distance-augmented car data, cached per driver."""
+        if drv not in self._fastest_cache:
+            lap = self.laps.pick_drivers(drv).pick_fastest()
+            car = None
+            if lap is not None:
+                car = self._downcast(lap.get_car_data().add_distance())
+            self._fastest_cache[drv] = (lap, car)
+        return self._fastest_cache[drv]
+
+    # FastF1 telemetry arrives as float64/int64; these fields fit in much
+    # narrower types, which halves memory traffic in everything downstream
+    _TEL_DTYPES = {'Speed': 'float32', 'Throttle': 'float32', 'Brake': 'bool',
+                   'nGear': 'int8', 'RPM': 'int32', 'DRS': 'int8'}
+
+    def _downcast(self, tel):
+        """Shrinks telemetry columns to compact dtypes (only those present)."""
+        dtypes = {col: dt for col, dt in self._TEL_DTYPES.items() if col in tel.columns}
+        return tel.astype(dtypes, copy=False)
+
+    def _export_one_driver(self, drv, final_dir, fmt="parquet"):
+        """Collects and writes one driver's telemetry; returns the file path."""
+        name = self._driver_abbr[drv]
+
+        # Select all laps for this driver (including slow ones for completeness)
+        driver_laps = self.session.laps.pick_drivers(drv)
+
+        if driver_laps.empty:
+            return None
+
+        print(f"Processing {name}...")
+
+        # Collect per-lap frames and concatenate ONCE at the end:
+        # growing a frame with pd.concat per lap reallocates every
+        # existing row each time (O(N^2) in total rows)
+        tel_frames = []
+        for _, lap in driver_laps.iterlaps():
+            try:
+                # Get telemetry and add lap number
+                tel = lap.get_telemetry().assign(LapNumber=lap["LapNumber"], Driver=name)
+                tel_frames.append(self._downcast(tel))
+            except Exception:
+                continue
+
+        if not tel_frames:
+            return None
+
+        full_tel = pd.concat(tel_frames, ignore_index=True, copy=False)
+        if fmt == "parquet":
+            file_path = final_dir / f"{name}_Telemetry.parquet"
+            # zstd-compressed columnar output: the repeated Driver/LapNumber
+            # columns dictionary-encode to a fraction of their CSV size
+            full_tel.to_parquet(file_path, engine='pyarrow',
+                                compression='zstd', row_group_size=100_000)
+        else:
+            file_path = final_dir / f"{name}_Telemetry.csv"
+            # chunksize caps the serialization buffer for long races
+            full_tel.to_csv(file_path, index=False, chunksize=50_000)
+        return file_path
+
+    def export_to_csv(self, output_folder="telemetry_data", fmt=None):
         """
-        Exports detailed telemetry for every driver to CSV files.
+        Exports detailed telemetry for every driver, one file per driver.
+        Writes Parquet when pyarrow is available, CSV otherwise;
+        pass fmt='csv' or fmt='parquet' to force a format.
         """
-        print(f"Starting Telemetry Export to '{output_folder}'...")
-        
+        if fmt is None:
+            fmt = "parquet" if HAS_PYARROW else "csv"
+        print(f"Starting Telemetry Export to '{output_folder}' ({fmt})...")
+
         # Ensure output directory exists
         out_dir = Path(output_folder)
         out_dir.mkdir(parents=True, exist_ok=True)
-        
+
         # Create a specific subfolder for this session to keep things organized
         session_subfolder = self._get_save_name("Exports")
         final_dir = out_dir / session_subfolder
         final_dir.mkdir(parents=True, exist_ok=True)
 
-        for drv in self.session.drivers:
-            driver_info = self.session.get_driver(drv)
-            name = driver_info["Abbreviation"]
-            
-            # Select all laps for this driver (including slow ones for completeness)
-            driver_laps = self.session.laps.pick_drivers(drv)
+        # Drivers are independent jobs: run the fetch + serialize across a
+        # thread pool (pandas releases the GIL for the heavy work)
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            futures = [pool.submit(self._export_one_driver, drv, final_dir, fmt)
+                       for drv in self.session.drivers]
+            for future in as_completed(futures):
+                future.result()
 
-            if driver_laps.empty:
-                continue
-
-            print(f"Processing {name}...")
-            
-            # Initialize empty DataFrame
-            full_tel = pd.DataFrame()
-            
-            # Iterate laps and append telemetry
-            for _, lap in driver_laps.iterlaps():
-                try:
-                    # Get telemetry and add lap number
-                    tel = lap.get_telemetry()
-                    tel["LapNumber"] = lap["LapNumber"]
-                    tel["Driver"] = name
-                    full_tel = pd.concat([full_tel, tel], ignore_index=True)
-                except Exception:
-                    continue
-
-            # Save CSV
-            if not full_tel.empty:
-                file_name = f"{name}_Telemetry.csv"
-                full_tel.to_csv(final_dir / file_name, index=False)
-                
         print(f"All files saved to: {final_dir}")
 
-    def speed_comparison(self, drivers=None):
+    def speed_comparison(self, drivers=None, dpi=150):
         """
         Plots Speed vs Distance for the fastest lap of selected drivers.
         """
@@ -118,47 +179,61 @@ class TelemetryAnalyzer:
             return
 
         print(f"Generating Speed Trace Comparison: {drivers}...")
-        
-        plt.figure(figsize=(16, 8))
-        
+
+        segments, colors, labels = [], [], []
         for drv in drivers:
-            # Get fastest lap
-            fastest_lap = self.laps.pick_drivers(drv).pick_fastest()
+            # Get fastest lap (cached across comparison calls)
+            fastest_lap, car_data = self._get_fastest(drv)
             if fastest_lap is None: continue
-            
+
             team = fastest_lap['Team']
-            color = self.team_colors.get(team, '#CCCCCC')
-            
-            # Get Car Data
-            car_data = fastest_lap.get_car_data().add_distance()
-            
-            plt.plot(car_data['Distance'], car_data['Speed'], 
-                     color=color, label=f"{drv} ({fastest_lap['LapTime'].total_seconds():.3f}s)",
-                     linewidth=2)
+            segments.append(np.column_stack([car_data['Distance'].to_numpy(),
+                                             car_data['Speed'].to_numpy()]))
+            colors.append(self.team_colors.get(team, '#CCCCCC'))
+            labels.append(f"{drv} ({fastest_lap['LapTime'].total_seconds():.3f}s)")
 
-        plt.title(f"Top Speed Comparison - Fastest Lap", fontsize=16)
-        plt.xlabel("Distance (m)", fontsize=12)
-        plt.ylabel("Speed (km/h)", fontsize=12)
-        plt.legend(loc='lower right')
-        plt.grid(True, linestyle='--', alpha=0.3)
+        if not segments:
+            print("No laps found for the requested drivers.")
+            return
+
+        fig, ax = plt.subplots(figsize=(16, 8))
+
+        # One batched draw call for all traces instead of a Line2D per driver;
+        # rasterized so the dense traces go raster while text stays vector
+        lc = LineCollection(segments, colors=colors, linewidths=2)
+        lc.set_rasterized(True)
+        ax.add_collection(lc)
+        all_xy = np.concatenate(segments)
+        ax.set_xlim(0, all_xy[:, 0].max())
+        ax.set_ylim(all_xy[:, 1].min() - 10, all_xy[:, 1].max() + 10)
+
+        # Collections don't feed the legend, so build proxy artists
+        handles = [Line2D([0], [0], color=c, linewidth=2, label=l)
+                   for c, l in zip(colors, labels)]
+
+        ax.set_title(f"Top Speed Comparison - Fastest Lap", fontsize=16)
+        ax.set_xlabel("Distance (m)", fontsize=12)
+        ax.set_ylabel("Speed (km/h)", fontsize=12)
+        ax.legend(handles=handles, loc='lower right')
+        ax.grid(True, linestyle='--', alpha=0.3)
         sns.despine(offset=10, trim=True)
         
         filename = self._get_save_name("Telemetry_SpeedTrace.png")
         plt.tight_layout()
-        plt.savefig(filename, dpi=300)
+        plt.savefig(filename, dpi=dpi)
         print(f"Saved {filename}")
         plt.show()
 
-    def delta_to_driver(self, ref_driver, comp_driver):
+    def delta_to_driver(self, ref_driver, comp_driver, dpi=150):
         """
         Plots the time delta (gap) between two drivers over a single lap.
         Positive Delta = Comparison driver is SLOWER.
         """
         print(f"Calculating Delta: {ref_driver} (Ref) vs {comp_driver}...")
         
-        # Get fastest laps
-        lap_ref = self.laps.pick_drivers(ref_driver).pick_fastest()
-        lap_comp = self.laps.pick_drivers(comp_driver).pick_fastest()
+        # Get fastest laps (cached across comparison calls)
+        lap_ref, _ = self._get_fastest(ref_driver)
+        lap_comp, _ = self._get_fastest(comp_driver)
         
         if lap_ref is None or lap_comp is None:
             print("Could not find laps for one or both drivers.")
@@ -171,26 +246,33 @@ class TelemetryAnalyzer:
         ref_color = self.team_colors.get(lap_ref['Team'], '#CCCCCC')
         comp_color = self.team_colors.get(lap_comp['Team'], '#CCCCCC')
 
+        # Plain float32 arrays: fill_between otherwise goes through pandas
+        # label alignment twice, recomputing the sign comparison each time
+        delta_arr = np.asarray(delta_time, dtype=np.float32)
+        dist_arr = ref_tel['Distance'].to_numpy(dtype=np.float32)
+        pos = delta_arr > 0
+        neg = ~pos
+
         plt.figure(figsize=(16, 8))
-        
+
         # Plot Delta Line
-        plt.plot(ref_tel['Distance'], delta_time, color='white', linewidth=1.5)
-        
+        plt.plot(dist_arr, delta_arr, color='white', linewidth=1.5)
+
         # Fill area to show who is ahead
         # If delta < 0 (Ref is slower/behind), fill with Ref color
         # If delta > 0 (Ref is faster/ahead), fill with Comp color (Comp is losing time)
-        
+
         # Note: fastf1 delta_time is calculated as (comp - ref).
         # So if result is POSITIVE, Comp is BEHIND (Ref is faster).
-        
+
         plt.axhline(0, color='gray', linestyle='--', linewidth=1)
-        
-        plt.fill_between(ref_tel['Distance'], delta_time, 0, 
-                         where=delta_time > 0, 
+
+        plt.fill_between(dist_arr, delta_arr, 0,
+                         where=pos,
                          facecolor=comp_color, alpha=0.5, label=f"{comp_driver} losing time")
-        
-        plt.fill_between(ref_tel['Distance'], delta_time, 0, 
-                         where=delta_time < 0, 
+
+        plt.fill_between(dist_arr, delta_arr, 0,
+                         where=neg,
                          facecolor=ref_color, alpha=0.5, label=f"{ref_driver} losing time")
 
         plt.title(f"Time Delta: {ref_driver} (Reference) vs {comp_driver}", fontsize=16)
@@ -202,11 +284,11 @@ class TelemetryAnalyzer:
         
         filename = self._get_save_name(f"Telemetry_Delta_{ref_driver}_vs_{comp_driver}.png")
         plt.tight_layout()
-        plt.savefig(filename, dpi=300)
+        plt.savefig(filename, dpi=dpi)
         print(f"Saved {filename}")
         plt.show()
 
-    def throttle_comparison(self, drivers=None):
+    def throttle_comparison(self, drivers=None, dpi=150):
         """
         Plots Throttle % vs Distance.
         """
@@ -215,30 +297,45 @@ class TelemetryAnalyzer:
             return
 
         print(f"Generating Throttle Trace Comparison: {drivers}...")
-        
-        plt.figure(figsize=(16, 5))
-        
+
+        segments, colors, labels = [], [], []
         for drv in drivers:
-            fastest_lap = self.laps.pick_drivers(drv).pick_fastest()
+            fastest_lap, car_data = self._get_fastest(drv)
             if fastest_lap is None: continue
-            
+
             team = fastest_lap['Team']
-            color = self.team_colors.get(team, '#CCCCCC')
-            
-            car_data = fastest_lap.get_car_data().add_distance()
-            
-            plt.plot(car_data['Distance'], car_data['Throttle'], 
-                     color=color, label=drv, linewidth=1.5)
+            segments.append(np.column_stack([car_data['Distance'].to_numpy(),
+                                             car_data['Throttle'].to_numpy()]))
+            colors.append(self.team_colors.get(team, '#CCCCCC'))
+            labels.append(drv)
 
-        plt.title(f"Throttle Application Comparison", fontsize=16)
-        plt.xlabel("Distance (m)", fontsize=12)
-        plt.ylabel("Throttle %", fontsize=12)
-        plt.legend(loc='lower right')
-        plt.grid(True, linestyle='--', alpha=0.3)
+        if not segments:
+            print("No laps found for the requested drivers.")
+            return
+
+        fig, ax = plt.subplots(figsize=(16, 5))
+
+        # One batched draw call for all traces instead of a Line2D per driver;
+        # rasterized so the dense traces go raster while text stays vector
+        lc = LineCollection(segments, colors=colors, linewidths=1.5)
+        lc.set_rasterized(True)
+        ax.add_collection(lc)
+        all_xy = np.concatenate(segments)
+        ax.set_xlim(0, all_xy[:, 0].max())
+        ax.set_ylim(-5, 105)
+
+        handles = [Line2D([0], [0], color=c, linewidth=1.5, label=l)
+                   for c, l in zip(colors, labels)]
+
+        ax.set_title(f"Throttle Application Comparison", fontsize=16)
+        ax.set_xlabel("Distance (m)", fontsize=12)
+        ax.set_ylabel("Throttle %", fontsize=12)
+        ax.legend(handles=handles, loc='lower right')
+        ax.grid(True, linestyle='--', alpha=0.3)
         sns.despine(offset=10, trim=True)
         
         filename = self._get_save_name("Telemetry_ThrottleTrace.png")
         plt.tight_layout()
-        plt.savefig(filename, dpi=300)
+        plt.savefig(filename, dpi=dpi)
         print(f"Saved {filename}")
         plt.show()
\ No newline at end of file
@@ -12,6 +12,14 @@ try:
 except Exception:
     pass
 
+# duckdb is optional: when present, the median-ordering aggregations run
+# through its vectorized SQL engine directly over the pandas frame
+try:
+    import duckdb
+    HAS_DUCKDB = True
+except Exception:
+    HAS_DUCKDB = False
+
 class TimingAnalyzer:
     """
     Macro-level analysis of Race Pace, Tyre Degradation, and Stints.
@@ -29,8 +37,12 @@ class TimingAnalyzer:
         else:
             self.team_colors = team_colors
 
+        # Timedelta -> seconds conversion done once here; every plot method
+        # reads LapTimeSec instead of copying the frame to re-derive it
         self.laps = session.laps.pick_quicklaps().pick_wo_box()
-        self.all_laps = session.laps 
+        self.laps = self.laps.assign(
+            LapTimeSec=self.laps['LapTime'].dt.total_seconds().astype('float32'))
+        self.all_laps = session.laps
 
     def _load_default_colors(self):
         """Loads team_colors.json from the same directory as this script."""
@@ -54,39 +66,54 @@ class TimingAnalyzer:
         session_id = session_type_map.get(self.session.name, self.session.name.replace(" ", ""))
         return f"{event_name}{year}_{session_id}_{suffix}.png"
 
-    def pace_distribution(self):
+    def _median_order(self, df, value_col):
+        """Drivers sorted by their median of value_col, fastest first."""
+        if HAS_DUCKDB:
+            laps = df[['Driver', value_col]]  # noqa: F841 - read by name in the query
+            return duckdb.sql(
+                f"SELECT Driver FROM laps GROUP BY Driver "
+                f"ORDER BY median({value_col}) ASC"
+            ).df()['Driver'].tolist()
+        return df.groupby('Driver')[value_col].median().sort_values().index.tolist()
+
+    def pace_distribution(self, dpi=150):
         print("Generating Pace Distribution Boxplot...")
-        df = self.laps.copy()
-        df['LapTimeSec'] = df['LapTime'].dt.total_seconds()
-        
-        order = df.groupby('Driver')['LapTimeSec'].median().sort_values().index
-        palette = {driver: self.team_colors.get(team, '#CCCCCC') 
-                   for driver, team in zip(df['Driver'], df['Team'])}
-
-        plt.figure(figsize=(16, 8))
-        sns.boxplot(
-            data=df, x='Driver', y='LapTimeSec', 
-            order=order, palette=palette, 
-            whis=1.5, fliersize=3, linewidth=1.2
-        )
-        
-        plt.title(f"Race Pace Distribution - {self.session.event.year} {self.session.event.EventName}", fontsize=16)
-        plt.xlabel("Driver", fontsize=12)
-        plt.ylabel("Lap Time (s)", fontsize=12)
-        plt.grid(True, which='both', axis='y', linestyle='--', linewidth=0.5, alpha=0.3)
+        df = self.laps
+
+        order = self._median_order(df, 'LapTimeSec')
+        # Dedupe before mapping: the frame has thousands of rows but only
+        # ~20 driver/team pairs to color
+        driver_team = df[['Driver', 'Team']].drop_duplicates()
+        palette = dict(zip(driver_team['Driver'],
+                           driver_team['Team'].map(self.team_colors).fillna('#CCCCCC')))
+
+        # Boxplot straight from NumPy arrays: seaborn would re-group the
+        # frame internally to recompute the quartiles we already ordered by
+        per_driver = [df.loc[df['Driver'] == d, 'LapTimeSec'].to_numpy() for d in order]
+
+        fig, ax = plt.subplots(figsize=(16, 8))
+        bp = ax.boxplot(per_driver, tick_labels=list(order), whis=1.5, showfliers=True,
+                        flierprops={'markersize': 3}, widths=0.6,
+                        patch_artist=True, medianprops={'color': 'white'})
+        for box, drv in zip(bp['boxes'], order):
+            box.set_facecolor(palette.get(drv, '#CCCCCC'))
+
+        ax.set_title(f"Race Pace Distribution - {self.session.event.year} {self.session.event.EventName}", fontsize=16)
+        ax.set_xlabel("Driver", fontsize=12)
+        ax.set_ylabel("Lap Time (s)", fontsize=12)
+        ax.grid(True, which='both', axis='y', linestyle='--', linewidth=0.5, alpha=0.3)
         sns.despine(offset=10, trim=True)
         
         filename = self._get_save_name("Timing_PaceDistribution")
         plt.tight_layout()
-        plt.savefig(filename, dpi=300)
+        plt.savefig(filename, dpi=dpi)
         print(f"Saved {filename}")
         plt.show()
 
-    def tyre_degradation(self, drivers=None, compound=None):
+    def tyre_degradation(self, drivers=None, compound=None, dpi=150):
         print("Analyzing Tyre Degradation & Consistency...")
-        df = self.laps.copy()
-        df['LapTimeSec'] = df['LapTime'].dt.total_seconds()
-        
+        df = self.laps
+
         if drivers is None:
             drivers = list(df['Driver'].unique())[:5]
             
@@ -94,66 +121,81 @@ class TimingAnalyzer:
         if compound:
             df = df[df['Compound'] == compound]
 
-        plt.figure(figsize=(12, 8))
+        fig, ax = plt.subplots(figsize=(12, 8))
         for drv in drivers:
             drv_data = df[df['Driver'] == drv]
             if drv_data.empty: continue
-            
+
             color = self.team_colors.get(drv_data.iloc[0]['Team'], '#CCCCCC')
-            sns.regplot(
-                data=drv_data, x='LapNumber', y='LapTimeSec',
-                label=drv, color=color, scatter_kws={'s': 20, 'alpha': 0.6},
-                line_kws={'linewidth': 2}
-            )
-
-        plt.title(f"Tyre Degradation Analysis (Pace Evolution)", fontsize=16)
-        plt.xlabel("Lap Number", fontsize=12)
-        plt.ylabel("Lap Time (s)", fontsize=12)
-        plt.legend()
-        plt.grid(True, linestyle='--', alpha=0.3)
+            x = drv_data['LapNumber'].to_numpy(dtype='float64')
+            y = drv_data['LapTimeSec'].to_numpy(dtype='float64')
+
+            # Closed-form OLS via polyfit: regplot fits the same line but
+            # also bootstraps a confidence band (1000 resamples) per driver
+            ax.scatter(x, y, s=20, alpha=0.6, color=color, label=drv, rasterized=True)
+            if len(x) > 1:
+                coeffs = np.polyfit(x, y, 1)
+                xr = np.array([x.min(), x.max()])
+                ax.plot(xr, np.polyval(coeffs, xr), color=color, linewidth=2)
+
+        ax.set_title(f"Tyre Degradation Analysis (Pace Evolution)", fontsize=16)
+        ax.set_xlabel("Lap Number", fontsize=12)
+        ax.set_ylabel("Lap Time (s)", fontsize=12)
+        ax.legend()
+        ax.grid(True, linestyle='--', alpha=0.3)
         sns.despine(offset=10, trim=True)
         
         filename = self._get_save_name("Timing_TyreDegradation")
         plt.tight_layout()
-        plt.savefig(filename, dpi=300)
+        plt.savefig(filename, dpi=dpi)
         print(f"Saved {filename}")
         plt.show()
 
-    def delta_to_best(self):
+    def delta_to_best(self, dpi=150):
         print("Calculating Delta to Session Best Lap...")
         fastest_lap = self.laps.pick_fastest()
         best_time = fastest_lap['LapTime'].total_seconds()
         print(f"Session Best: {fastest_lap['Driver']} - {best_time:.3f}s")
         
-        df = self.laps.copy()
-        df['LapTimeSec'] = df['LapTime'].dt.total_seconds()
-        df['DeltaToBest'] = df['LapTimeSec'] - best_time
+        df = self.laps.assign(DeltaToBest=self.laps['LapTimeSec'] - best_time)
         
-        order = df.groupby('Driver')['DeltaToBest'].median().sort_values().index
-        palette = {driver: self.team_colors.get(team, '#CCCCCC') 
-                   for driver, team in zip(df['Driver'], df['Team'])}
-
-        plt.figure(figsize=(16, 8))
-        sns.stripplot(
-            data=df, x='Driver', y='DeltaToBest',
-            order=order, palette=palette,
-            size=4, alpha=0.7, jitter=0.25
-        )
-        sns.pointplot(
-            data=df, x='Driver', y='DeltaToBest',
-            order=order, color='white', 
-            errorbar=None, markers="D", scale=0.6, join=False
-        )
-
-        plt.title(f"Pace Deficit to Best Lap (+{best_time:.3f}s)", fontsize=16)
-        plt.xlabel("Driver (Sorted by Median Deficit)", fontsize=12)
-        plt.ylabel("Seconds Slower than Best Lap", fontsize=12)
-        plt.ylim(-0.5, 5.0) 
-        plt.grid(True, axis='y', linestyle='--', alpha=0.3)
+        order = self._median_order(df, 'DeltaToBest')
+        # Dedupe before mapping: the frame has thousands of rows but only
+        # ~20 driver/team pairs to color
+        driver_team = df[['Driver', 'Team']].drop_duplicates()
+        palette = dict(zip(driver_team['Driver'],
+                           driver_team['Team'].map(self.team_colors).fillna('#CCCCCC')))
+
+        # Jitter computed vectorized up front: stripplot lays out every
+        # point through Python-level loops, which drags on 1000+ race laps
+        driver_pos = {d: i for i, d in enumerate(order)}
+        xs = (df['Driver'].map(driver_pos).to_numpy(dtype=np.float32)
+              + np.random.uniform(-0.25, 0.25, size=len(df)).astype(np.float32))
+        ys = df['DeltaToBest'].to_numpy(dtype=np.float32)
+        point_colors = [palette[d] for d in df['Driver']]
+
+        medians = df.groupby('Driver')['DeltaToBest'].median()
+
+        fig, ax = plt.subplots(figsize=(16, 8))
+        # Thousands of lap points: rasterized so the save stays fast
+        # while the text and axes remain vector
+        ax.scatter(xs, ys, c=point_colors, s=16, alpha=0.7, rasterized=True)
+
+        # White diamond per driver marks the median (was the pointplot overlay)
+        ax.scatter(range(len(order)), medians[order].to_numpy(), marker='D',
+                   c='white', s=36, zorder=5)
+        ax.set_xticks(range(len(order)))
+        ax.set_xticklabels(order)
+
+        ax.set_title(f"Pace Deficit to Best Lap (+{best_time:.3f}s)", fontsize=16)
+        ax.set_xlabel("Driver (Sorted by Median Deficit)", fontsize=12)
+        ax.set_ylabel("Seconds Slower than Best Lap", fontsize=12)
+        ax.set_ylim(-0.5, 5.0)
+        ax.grid(True, axis='y', linestyle='--', alpha=0.3)
         sns.despine(offset=10, trim=True)
         
         filename = self._get_save_name("Timing_DeltaToBest")
         plt.tight_layout()
-        plt.savefig(filename, dpi=300)
+        plt.savefig(filename, dpi=dpi)
         print(f"Saved {filename}")
         plt.show()
\ No newline at end of file
@@ -60,7 +60,7 @@ class GainPhase:
     def __init__(self, parent):
         self.parent = parent
 
-    def map(self, ref_driver, comp_driver):
+    def map(self, ref_driver, comp_driver, dpi=150):
         """
         Plots the track map colored by time delta.
         Purple/Green = Reference driver is FASTER (Gaining).
@@ -83,12 +83,18 @@ class GainPhase:
         
         # 3. Prepare Data for Plotting
         # We need X, Y coordinates from the reference telemetry
-        x = ref_tel['X'].values
-        y = ref_tel['Y'].values
-        
-        # Create segments (lines connecting point i to i+1)
-        points = np.array([x, y]).T.reshape(-1, 1, 2)
-        segments = np.concatenate([points[:-1], points[1:]], axis=1)
+        x = ref_tel['X'].to_numpy(dtype=np.float32)
+        y = ref_tel['Y'].to_numpy(dtype=np.float32)
+        delta_arr = np.asarray(delta_time, dtype=np.float32)
+
+        # Create segments (lines connecting point i to i+1), written
+        # straight into one preallocated array instead of transposing,
+        # reshaping and concatenating intermediates
+        segments = np.empty((len(x) - 1, 2, 2), dtype=np.float32)
+        segments[:, 0, 0] = x[:-1]
+        segments[:, 0, 1] = y[:-1]
+        segments[:, 1, 0] = x[1:]
+        segments[:, 1, 1] = y[1:]
         
         # 4. Setup Color Map
         # We want a diverging map. 
@@ -100,7 +106,7 @@ class GainPhase:
         
         # Normalize the delta to center around 0
         # We clamp extreme outliers to keeping the color scale useful
-        max_delta = max(abs(delta_time.min()), abs(delta_time.max()))
+        max_delta = max(abs(delta_arr.min()), abs(delta_arr.max()))
         norm = plt.Normalize(-max_delta, max_delta)
 
         # 5. Plot
@@ -108,7 +114,9 @@ class GainPhase:
         
         # Create the LineCollection
         lc = LineCollection(segments, cmap=cmap, norm=norm, linestyle='-', linewidth=5)
-        lc.set_array(delta_time)
+        lc.set_array(delta_arr)
+        # Dense colored segments: rasterize so only the map goes raster
+        lc.set_rasterized(True)
         
         ax = plt.gca()
         ax.add_collection(lc)
@@ -129,6 +137,6 @@ class GainPhase:
         
         # Save
         filename = self.parent._get_save_name(f"Track_GainMap_{ref_driver}_vs_{comp_driver}")
-        plt.savefig(filename, dpi=300, bbox_inches='tight')
+        plt.savefig(filename, dpi=dpi, bbox_inches='tight')
         print(f"Saved {filename}")
         plt.show()
\ No newline at end of file
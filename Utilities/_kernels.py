@@ -0,0 +1,118 @@
+import numpy as np
+
+# Numba is optional: with it installed the reduction loops compile to
+# machine code, without it we fall back to equivalent NumPy reductions.
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except Exception:
+    HAS_NUMBA = False
+
+# Each kernel takes a value column sorted by group id plus the start offset
+# of every group, and reduces every group in a single pass over the
+# contiguous array (one entry per group in the result).
+
+if HAS_NUMBA:
+
+    @njit(cache=True, fastmath=True)
+    def group_min(values, starts):
+        n_groups = len(starts)
+        out = np.empty(n_groups, dtype=values.dtype)
+        for g in range(n_groups):
+            end = starts[g + 1] if g + 1 < n_groups else len(values)
+            m = values[starts[g]]
+            for i in range(starts[g] + 1, end):
+                if values[i] < m:
+                    m = values[i]
+            out[g] = m
+        return out
+
+    @njit(cache=True, fastmath=True)
+    def group_mean(values, starts):
+        n_groups = len(starts)
+        out = np.empty(n_groups, dtype=np.float64)
+        for g in range(n_groups):
+            end = starts[g + 1] if g + 1 < n_groups else len(values)
+            total = 0.0
+            for i in range(starts[g], end):
+                total += values[i]
+            out[g] = total / (end - starts[g])
+        return out
+
+    @njit(cache=True)
+    def find_accel_delta(dist, speed, time_ns, search_start, search_end, v0, v1):
+        """
+        Seconds taken to accelerate from v0 to v1 inside the distance window
+        (search_start, search_end). Returns NaN when the lap never crosses
+        both thresholds in the window.
+        """
+        # Single pass with a two-state machine: looking for the v0 crossing,
+        # then for the v1 crossing, returning as soon as both are seen
+        n = len(dist)
+        t0 = np.int64(0)
+        armed = False
+        for i in range(n):
+            if not (search_start < dist[i] < search_end):
+                continue
+            if not armed:
+                if speed[i] >= v0:
+                    t0 = time_ns[i]
+                    armed = True
+            elif speed[i] >= v1 and time_ns[i] > t0:
+                return (time_ns[i] - t0) * 1e-9
+        return np.nan
+
+    @njit(cache=True, fastmath=True)
+    def group_span(values, starts):
+        n_groups = len(starts)
+        out = np.empty(n_groups, dtype=values.dtype)
+        for g in range(n_groups):
+            end = starts[g + 1] if g + 1 < n_groups else len(values)
+            lo = values[starts[g]]
+            hi = lo
+            for i in range(starts[g] + 1, end):
+                if values[i] < lo:
+                    lo = values[i]
+                elif values[i] > hi:
+                    hi = values[i]
+            out[g] = hi - lo
+        return out
+
+else:
+
+    def group_min(values, starts):
+        return np.minimum.reduceat(values, starts)
+
+    def group_mean(values, starts):
+        counts = np.diff(np.append(starts, len(values)))
+        return np.add.reduceat(values, starts) / counts
+
+    def group_span(values, starts):
+        return np.maximum.reduceat(values, starts) - np.minimum.reduceat(values, starts)
+
+    def find_accel_delta(dist, speed, time_ns, search_start, search_end, v0, v1):
+        """
+        Seconds taken to accelerate from v0 to v1 inside the distance window
+        (search_start, search_end). Returns NaN when the lap never crosses
+        both thresholds in the window.
+        """
+        in_window = (dist > search_start) & (dist < search_end)
+        start_idx = np.flatnonzero(in_window & (speed >= v0))
+        if len(start_idx) == 0:
+            return np.nan
+        # Only the tail after the v0 crossing can hold the v1 crossing,
+        # so the second scan works on the shortened views
+        i0 = start_idx[0]
+        t0 = time_ns[i0]
+        end_idx = np.flatnonzero(in_window[i0 + 1:] & (speed[i0 + 1:] >= v1)
+                                 & (time_ns[i0 + 1:] > t0))
+        if len(end_idx) == 0:
+            return np.nan
+        return (time_ns[i0 + 1 + end_idx[0]] - t0) * 1e-9
+
+
+GROUP_KERNELS = {
+    'min': group_min,
+    'mean': group_mean,
+    'span': group_span,
+}